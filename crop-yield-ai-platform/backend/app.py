@@ -1,45 +1,96 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session
+from flask import Flask, render_template, request, redirect, url_for, flash, session, g, Response
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Engine
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from flask_wtf import FlaskForm
+from flask_caching import Cache
 from wtforms import StringField, PasswordField, FloatField, SelectField, TextAreaField, IntegerField
 from wtforms.validators import DataRequired, Email, Length
 from email_validator import validate_email, EmailNotValidError
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 import os
-import json
+import orjson
 from datetime import datetime
+from functools import wraps
+from pathlib import Path
 import requests
-import joblib
+import sqlite3
 import numpy as np
-import pandas as pd
-from PIL import Image
 import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'models'))
-from enhanced_prediction import CropYieldPredictor
+import threading
+import time
+import uuid
 
 app = Flask(__name__, template_folder='../frontend/templates', static_folder='../frontend/static')
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///crop_yield_platform.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Keep compiled SQL for the app's small, repetitive ORM queries
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'query_cache_size': 1200}
 app.config['UPLOAD_FOLDER'] = '../data/uploads'
 
 db = SQLAlchemy(app)
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL so dashboard/API reads don't block behind prediction writes"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.close()
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
-# Initialize enhanced prediction model
-predictor = CropYieldPredictor()
+# Rendered-page cache for pages without per-request data
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+
+def page_cache_key():
+    """Cache key for a rendered page: its path plus the viewer, since base.html shows the user"""
+    viewer = current_user.get_id() if current_user.is_authenticated else 'anonymous'
+    return f'page:{request.path}:{viewer}'
+
+def skip_page_cache():
+    # Only plain GETs are cached, and pending flash messages still need rendering
+    return request.method != 'GET' or '_flashes' in session
+
+# Enhanced prediction model, created on first use and kept on app.extensions
+_MODEL_LOCK = threading.Lock()
+_MODELS_LOADED = threading.Event()
+
+def _get_predictor():
+    """Return the shared CropYieldPredictor, importing the ML stack on first call"""
+    predictor = app.extensions.get('predictor')
+    if predictor is None:
+        with _MODEL_LOCK:
+            predictor = app.extensions.get('predictor')
+            if predictor is None:
+                sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'models'))
+                from enhanced_prediction import CropYieldPredictor
+                predictor = app.extensions['predictor'] = CropYieldPredictor()
+    return predictor
+
+def _ensure_models_loaded(train_if_missing=True):
+    """Load the predictor's models exactly once, even under concurrent requests"""
+    predictor = _get_predictor()
+    if not _MODELS_LOADED.is_set():
+        with _MODEL_LOCK:
+            if not _MODELS_LOADED.is_set() and predictor.load_models(train_if_missing):
+                _MODELS_LOADED.set()
+    return predictor
 
 # Database Models
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128))
+    password_hash = db.Column(db.String(256))
     name = db.Column(db.String(100))
     address = db.Column(db.String(200))
     regional_language = db.Column(db.String(50), default='english')
@@ -48,7 +99,7 @@ class User(UserMixin, db.Model):
 
 class Field(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     field_name = db.Column(db.String(100))
     soil_condition = db.Column(db.String(200))
     weather_condition = db.Column(db.String(200))
@@ -60,6 +111,9 @@ class Field(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class Prediction(db.Model):
+    # Serves the dashboard's "latest predictions for this user" lookup without a sort
+    __table_args__ = (db.Index('ix_pred_user_created', 'user_id', 'created_at'),)
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     field_id = db.Column(db.Integer, db.ForeignKey('field.id'), nullable=True)
@@ -71,7 +125,78 @@ class Prediction(db.Model):
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    # Fetch the user row at most once per request
+    user_id = int(user_id)
+    user = g.get('user')
+    if user is None or user.id != user_id:
+        user = g.user = db.session.get(User, user_id)
+    return user
+
+@app.teardown_request
+def clear_request_user(exc=None):
+    g.pop('user', None)
+
+def memoize_per_request(func):
+    """Cache a helper's result on flask.g for the rest of the current request"""
+    @wraps(func)
+    def wrapper(*args):
+        cache = g.setdefault('_request_memo', {})
+        key = (func.__name__,) + args
+        if key not in cache:
+            cache[key] = func(*args)
+        return cache[key]
+    return wrapper
+
+@memoize_per_request
+def get_dashboard_data(user_id):
+    """Fetch a user's fields and five most recent predictions"""
+    fields = db.session.query(Field).filter(Field.user_id == user_id).all()
+    recent_predictions = (
+        db.session.query(Prediction)
+        .filter_by(user_id=user_id)
+        .order_by(Prediction.created_at.desc())
+        .limit(5)
+        .all()
+    )
+    return fields, recent_predictions
+
+# Username -> (user id, password hash), kept briefly so repeated login
+# attempts for the same account don't each go to the database
+LOGIN_CACHE_TTL_SECONDS = 30
+LOGIN_CACHE_MAXSIZE = 1024
+_login_cache = {}
+_login_cache_lock = threading.Lock()
+
+def get_login_record(username):
+    """Return (user_id, password_hash) for username, or None if it doesn't exist"""
+    now = time.monotonic()
+    with _login_cache_lock:
+        entry = _login_cache.get(username)
+    if entry and now - entry[0] < LOGIN_CACHE_TTL_SECONDS:
+        return entry[1]
+    
+    row = db.session.query(User.id, User.password_hash).filter_by(username=username).first()
+    if row is None:
+        # Misses aren't cached so a freshly registered user can log in at once
+        return None
+    record = (row.id, row.password_hash)
+    with _login_cache_lock:
+        if username not in _login_cache and len(_login_cache) >= LOGIN_CACHE_MAXSIZE:
+            _login_cache.pop(next(iter(_login_cache)))
+        _login_cache[username] = (now, record)
+    return record
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def forget_login_records(mapper, connection, target):
+    """Invalidate cached login records whenever a user is changed or removed
+    
+    Covers ORM writes (e.g. a new password_hash); Core-level UPDATE/DELETE of
+    users bypasses this and must clear _login_cache itself. Other worker
+    processes may serve the old record until LOGIN_CACHE_TTL_SECONDS passes.
+    """
+    with _login_cache_lock:
+        _login_cache.clear()
 
 # Forms
 class LoginForm(FlaskForm):
@@ -100,74 +225,107 @@ class FieldForm(FlaskForm):
                           choices=[('rice', 'Rice'), ('wheat', 'Wheat'), ('sugarcane', 'Sugarcane'),
                                  ('cotton', 'Cotton'), ('maize', 'Maize')])
 
+# Build each form class's unbound field list at import instead of on the first request
+with app.test_request_context():
+    for _form_class in (LoginForm, RegisterForm, FieldForm):
+        _form_class(meta={'csrf': False})
+
 # Language Support
+TRANSLATIONS_PATH = Path(__file__).resolve().parent.parent / 'data' / 'translations.json'
+
 def load_translations():
-    translations = {}
+    """Parse translations.json (resolved next to the app, not the CWD)"""
     try:
-        with open('data/translations.json', 'r', encoding='utf-8') as f:
-            translations = json.load(f)
+        return orjson.loads(TRANSLATIONS_PATH.read_bytes())
     except FileNotFoundError:
-        translations = {
+        return {
             'english': {},
             'hindi': {},
             'odia': {}
         }
-    return translations
+
+# Parsed once at import; lookups never touch the disk
+_TRANSLATIONS = load_translations()
 
 def get_translation(key, language='english'):
-    translations = load_translations()
-    return translations.get(language, {}).get(key, key)
+    return _TRANSLATIONS.get(language, {}).get(key, key)
 
 # ML Model Functions
 def load_yield_model():
+    import joblib
     try:
         model = joblib.load('models/yield_prediction_model.pkl')
         return model
     except FileNotFoundError:
         return None
 
+_DUMMY_MODEL = None
+
 def create_dummy_model():
-    """Create a dummy model for demonstration"""
-    from sklearn.ensemble import RandomForestRegressor
-    
-    # Create dummy training data
-    X_dummy = np.random.rand(1000, 6)  # 6 features
-    y_dummy = np.random.rand(1000) * 10 + 2  # Yield between 2-12 tons/hectare
+    """Create a dummy model for demonstration, reusing the saved one when present"""
+    global _DUMMY_MODEL
+    if _DUMMY_MODEL is not None:
+        return _DUMMY_MODEL
     
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(X_dummy, y_dummy)
+    model = load_yield_model()
+    if model is None:
+        import joblib
+        from sklearn.ensemble import RandomForestRegressor
+        
+        # Create dummy training data
+        rng = np.random.default_rng(42)
+        X_dummy = rng.random((1000, 6), dtype=np.float32)  # 6 features
+        y_dummy = rng.random(1000, dtype=np.float32) * 10 + 2  # Yield between 2-12 tons/hectare
+        
+        model = RandomForestRegressor(n_estimators=100, n_jobs=-1, random_state=42)
+        model.fit(X_dummy, y_dummy)
+        
+        # Save the model
+        os.makedirs('models', exist_ok=True)
+        joblib.dump(model, 'models/yield_prediction_model.pkl')
     
-    # Save the model
-    os.makedirs('models', exist_ok=True)
-    joblib.dump(model, 'models/yield_prediction_model.pkl')
+    _DUMMY_MODEL = model
     return model
 
-def predict_yield_enhanced(crop_type, area, rainfall, temperature, soil_ph, fertilizer_usage, pest_control):
+# Numeric model inputs read from the prediction form, in model feature order,
+# with the default used when a field is left out
+_FEATURE_SPEC = (
+    ('area', 1.0),
+    ('rainfall', 1000.0),
+    ('temperature', 25.0),
+    ('soil_ph', 7.0),
+    ('fertilizer_usage', 50.0),
+    ('pest_control', 1.0),
+)
+
+def parse_features(form):
+    """Coerce the submitted numeric inputs into a 1-D feature array"""
+    return np.fromiter((float(form.get(name, default)) for name, default in _FEATURE_SPEC),
+                       dtype=np.float64, count=len(_FEATURE_SPEC))
+
+def predict_yield_enhanced(crop_type, features):
     """Enhanced yield prediction using the improved ML model"""
+    predictor = _get_predictor()
     try:
-        # Load models if not already loaded
-        if not predictor.models:
-            predictor.load_models()
+        predictor = _ensure_models_loaded()
         
         # Make prediction
-        predicted_yield, confidence, model_predictions = predictor.predict_yield(
-            crop_type, area, rainfall, temperature, soil_ph, fertilizer_usage, pest_control
-        )
+        predicted_yield, confidence, model_predictions = predictor.predict_yield(crop_type, *features)
         
-        return predicted_yield, confidence, model_predictions
+        # Hand plain Python floats back to the web layer
+        model_predictions = {name: float(pred) for name, pred in model_predictions.items()}
+        return float(predicted_yield), float(confidence), model_predictions
     except Exception as e:
         print(f"Enhanced prediction error: {e}")
         # Fallback to simple prediction
-        return predictor._fallback_prediction(
-            crop_type, area, rainfall, temperature, soil_ph, fertilizer_usage, pest_control
-        )
+        return predictor._fallback_prediction(crop_type, *features)
 
 def get_enhanced_recommendations(crop_type, predicted_yield, area, rainfall, temperature, 
                                soil_ph, fertilizer_usage, pest_control, soil_condition="", 
                                weather_condition=""):
     """Get enhanced recommendations using the improved model"""
     try:
-        return predictor.get_recommendations(
+        return _get_predictor().get_recommendations(
             crop_type, predicted_yield, area, rainfall, temperature, 
             soil_ph, fertilizer_usage, pest_control, soil_condition, weather_condition
         )
@@ -188,7 +346,7 @@ def get_enhanced_recommendations(crop_type, predicted_yield, area, rainfall, tem
 def get_market_insights(crop_type, predicted_yield, area):
     """Get market insights and profit projections"""
     try:
-        return predictor.get_market_insights(crop_type, predicted_yield, area)
+        return _get_predictor().get_market_insights(crop_type, predicted_yield, area)
     except Exception as e:
         print(f"Market insights error: {e}")
         return {
@@ -199,12 +357,61 @@ def get_market_insights(crop_type, predicted_yield, area):
             'profit_margin': 0
         }
 
+# Prediction results are kept server-side; the session cookie only carries a key.
+# Files (rather than a dict) so every worker process can serve the result page.
+RESULT_DIR = os.path.join(app.instance_path, 'prediction_results')
+RESULT_TTL_SECONDS = 3600
+# Expired results are swept at most this often (per process), not on every save
+RESULT_SWEEP_INTERVAL_SECONDS = 300
+_last_result_sweep = float('-inf')
+
+def sweep_prediction_results():
+    """Delete stored prediction results older than RESULT_TTL_SECONDS"""
+    now = time.time()
+    for entry in os.scandir(RESULT_DIR):
+        try:
+            if now - entry.stat().st_mtime > RESULT_TTL_SECONDS:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+def store_prediction_result(result):
+    """Save a prediction result and return the key to look it up later"""
+    global _last_result_sweep
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    now = time.monotonic()
+    if now - _last_result_sweep > RESULT_SWEEP_INTERVAL_SECONDS:
+        _last_result_sweep = now
+        sweep_prediction_results()
+    
+    key = uuid.uuid4().hex
+    with open(os.path.join(RESULT_DIR, f'{key}.json'), 'wb') as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY))
+    return key
+
+def load_prediction_result(key):
+    """Fetch a stored prediction result, or None if it is missing or expired"""
+    if not key:
+        return None
+    path = os.path.join(RESULT_DIR, f'{secure_filename(key)}.json')
+    try:
+        # The periodic sweep may not have run yet, so check expiry here too
+        if time.time() - os.path.getmtime(path) > RESULT_TTL_SECONDS:
+            os.remove(path)
+            return None
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+
 # Routes
 @app.route('/')
+@cache.cached(timeout=600, key_prefix=page_cache_key, unless=skip_page_cache)
 def index():
     return render_template('interactive_index.html')
 
 @app.route('/simple')
+@cache.cached(timeout=600, key_prefix=page_cache_key, unless=skip_page_cache)
 def simple_index():
     return render_template('index.html')
 
@@ -212,10 +419,12 @@ def simple_index():
 def login():
     form = LoginForm()
     if form.validate_on_submit():
-        user = User.query.filter_by(username=form.username.data).first()
-        if user and check_password_hash(user.password_hash, form.password.data):
-            login_user(user)
-            return redirect(url_for('dashboard'))
+        record = get_login_record(form.username.data)
+        if record and check_password_hash(record[1], form.password.data):
+            user = db.session.get(User, record[0])
+            if user:
+                login_user(user)
+                return redirect(url_for('dashboard'))
         flash('Invalid username or password')
     return render_template('login.html', form=form)
 
@@ -223,7 +432,7 @@ def login():
 def register():
     form = RegisterForm()
     if form.validate_on_submit():
-        existing_user = User.query.filter_by(username=form.username.data).first()
+        existing_user = db.session.query(User).filter_by(username=form.username.data).first()
         if existing_user:
             flash('Username already exists')
             return render_template('register.html', form=form)
@@ -231,7 +440,7 @@ def register():
         user = User(
             username=form.username.data,
             email=form.email.data,
-            password_hash=generate_password_hash(form.password.data),
+            password_hash=generate_password_hash(form.password.data, method='scrypt'),
             name=form.name.data,
             address=form.address.data,
             regional_language=form.regional_language.data
@@ -251,15 +460,13 @@ def logout():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    fields = Field.query.filter_by(user_id=current_user.id).all()
-    recent_predictions = Prediction.query.filter_by(user_id=current_user.id).order_by(Prediction.created_at.desc()).limit(5).all()
+    fields, recent_predictions = get_dashboard_data(current_user.id)
     return render_template('interactive_dashboard.html', fields=fields, predictions=recent_predictions)
 
 @app.route('/dashboard/simple')
 @login_required
 def simple_dashboard():
-    fields = Field.query.filter_by(user_id=current_user.id).all()
-    recent_predictions = Prediction.query.filter_by(user_id=current_user.id).order_by(Prediction.created_at.desc()).limit(5).all()
+    fields, recent_predictions = get_dashboard_data(current_user.id)
     return render_template('dashboard.html', fields=fields, predictions=recent_predictions)
 
 @app.route('/add_field', methods=['GET', 'POST'])
@@ -267,7 +474,7 @@ def simple_dashboard():
 def add_field():
     form = FieldForm()
     if form.validate_on_submit():
-        field = Field(
+        db.session.execute(insert(Field).values(
             user_id=current_user.id,
             field_name=form.field_name.data,
             soil_condition=form.soil_condition.data,
@@ -276,8 +483,7 @@ def add_field():
             field_type=form.field_type.data,
             area_hectares=form.area_hectares.data,
             crop_type=form.crop_type.data
-        )
-        db.session.add(field)
+        ))
         db.session.commit()
         flash('Field added successfully')
         return redirect(url_for('dashboard'))
@@ -289,17 +495,11 @@ def predict_yield_route():
         try:
             # Get form data
             crop_type = request.form.get('crop_type', 'rice')
-            area = float(request.form.get('area', 1))
-            rainfall = float(request.form.get('rainfall', 1000))
-            temperature = float(request.form.get('temperature', 25))
-            soil_ph = float(request.form.get('soil_ph', 7))
-            fertilizer_usage = float(request.form.get('fertilizer_usage', 50))
-            pest_control = float(request.form.get('pest_control', 1))
+            features = parse_features(request.form)
+            area, rainfall, temperature, soil_ph, fertilizer_usage, pest_control = features.tolist()
             
             # Make enhanced prediction
-            predicted_yield, confidence, model_predictions = predict_yield_enhanced(
-                crop_type, area, rainfall, temperature, soil_ph, fertilizer_usage, pest_control
-            )
+            predicted_yield, confidence, model_predictions = predict_yield_enhanced(crop_type, features)
             
             # Generate enhanced recommendations
             soil_condition = request.form.get('soil_condition', '')
@@ -312,15 +512,14 @@ def predict_yield_route():
             # Get market insights
             market_insights = get_market_insights(crop_type, predicted_yield, area)
             
-            # Save prediction
-            prediction = Prediction(
+            # Save prediction (Core insert; numpy scalars coerced for the SQLite driver)
+            db.session.execute(insert(Prediction).values(
                 user_id=current_user.id if current_user.is_authenticated else None,
                 crop_type=crop_type,
-                predicted_yield=predicted_yield,
-                confidence=confidence,
-                recommendations=json.dumps(recommendations)
-            )
-            db.session.add(prediction)
+                predicted_yield=float(predicted_yield),
+                confidence=float(confidence),
+                recommendations=orjson.dumps(recommendations, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+            ))
             db.session.commit()
             
             result = {
@@ -333,8 +532,8 @@ def predict_yield_route():
                 'market_insights': market_insights
             }
             
-            # Store result in session for enhanced results page
-            session['prediction_result'] = result
+            # Store result server-side and keep only its key in the session
+            session['prediction_id'] = store_prediction_result(result)
             return redirect(url_for('prediction_result'))
             
         except Exception as e:
@@ -345,7 +544,7 @@ def predict_yield_route():
 @app.route('/prediction-result')
 def prediction_result():
     """Display enhanced prediction result with visualizations"""
-    result = session.get('prediction_result')
+    result = load_prediction_result(session.get('prediction_id'))
     if not result:
         flash('No prediction results found. Please make a prediction first.', 'warning')
         return redirect(url_for('predict_yield_route'))
@@ -353,43 +552,69 @@ def prediction_result():
     return render_template('enhanced_prediction_result.html', result=result)
 
 @app.route('/universal_predict', methods=['GET', 'POST'])
+@cache.cached(timeout=600, key_prefix=page_cache_key, unless=skip_page_cache)
 def universal_predict():
     # Universal prediction without login
     return render_template('universal_predict.html')
 
+# Dummy weather data - in real implementation, integrate with weather API
+WEATHER_DATA = {
+    'temperature': 28.5,
+    'humidity': 75,
+    'rainfall_forecast': 25.4,
+    'wind_speed': 12.3,
+    'alert': 'Heavy rainfall expected in next 48 hours'
+}
+
+# Dummy market price data
+MARKET_PRICES = {
+    'rice': {'price': 2500, 'unit': 'per quintal', 'trend': 'up'},
+    'wheat': {'price': 2200, 'unit': 'per quintal', 'trend': 'stable'},
+    'sugarcane': {'price': 350, 'unit': 'per quintal', 'trend': 'down'},
+    'cotton': {'price': 6800, 'unit': 'per quintal', 'trend': 'up'},
+    'maize': {'price': 1800, 'unit': 'per quintal', 'trend': 'up'}
+}
+
+# The payloads are static, so serialize them once instead of on every hit
+_WEATHER_BYTES = orjson.dumps(WEATHER_DATA)
+_MARKET_BYTES = orjson.dumps(MARKET_PRICES)
+
+def cached_json_response(payload, max_age=60):
+    """Build a JSON response from pre-encoded bytes with browser caching enabled"""
+    return Response(payload, mimetype='application/json',
+                    headers={'Cache-Control': f'public, max-age={max_age}'})
+
 @app.route('/api/weather')
 def get_weather():
-    # Dummy weather data - in real implementation, integrate with weather API
-    weather_data = {
-        'temperature': 28.5,
-        'humidity': 75,
-        'rainfall_forecast': 25.4,
-        'wind_speed': 12.3,
-        'alert': 'Heavy rainfall expected in next 48 hours'
-    }
-    return jsonify(weather_data)
+    return cached_json_response(_WEATHER_BYTES)
 
 @app.route('/api/market_prices')
 def get_market_prices():
-    # Dummy market price data
-    prices = {
-        'rice': {'price': 2500, 'unit': 'per quintal', 'trend': 'up'},
-        'wheat': {'price': 2200, 'unit': 'per quintal', 'trend': 'stable'},
-        'sugarcane': {'price': 350, 'unit': 'per quintal', 'trend': 'down'},
-        'cotton': {'price': 6800, 'unit': 'per quintal', 'trend': 'up'},
-        'maize': {'price': 1800, 'unit': 'per quintal', 'trend': 'up'}
-    }
-    return jsonify(prices)
+    return cached_json_response(_MARKET_BYTES, max_age=300)
 
 @app.route('/cost_benefit')
+@cache.cached(timeout=600, key_prefix=page_cache_key, unless=skip_page_cache)
 def cost_benefit_calculator():
     return render_template('cost_benefit.html')
 
 @app.route('/help')
+@cache.cached(timeout=600, key_prefix=page_cache_key, unless=skip_page_cache)
 def help_system():
     return render_template('help.html')
 
-if __name__ == '__main__':
+def init_db():
+    """Create missing tables and indexes"""
     with app.app_context():
         db.create_all()
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+        # create_all() skips tables that already exist, so add any missing indexes
+        for table in (Field.__table__, Prediction.__table__):
+            for index in table.indexes:
+                index.create(db.engine, checkfirst=True)
+
+if __name__ == '__main__':
+    init_db()
+    if '--dev' in sys.argv:
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    else:
+        print("Database ready. Serve with: gunicorn -c gunicorn_conf.py backend.app:app")
+        print("(or run this script with --dev for the Flask development server)")
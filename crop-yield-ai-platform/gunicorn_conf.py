@@ -0,0 +1,43 @@
+"""
+Gunicorn configuration for Crop Yield AI Platform
+
+Usage (from the project root, after training the models once):
+    python models/enhanced_prediction.py
+    gunicorn -c gunicorn_conf.py backend.app:app
+"""
+
+bind = '0.0.0.0:5000'
+
+# Import the app (and the ML stack) once in the master; forked workers
+# then share the loaded models copy-on-write instead of each loading them
+preload_app = True
+workers = 4
+worker_class = 'gthread'
+threads = 2
+
+
+def when_ready(server):
+    """Prepare the database and load the models before workers are forked"""
+    from backend.app import app, db, init_db, _ensure_models_loaded, _MODELS_LOADED
+
+    init_db()
+    # Load only: training or predicting here would start OpenMP threads in the
+    # master, and forked workers would then deadlock on their first prediction
+    _ensure_models_loaded(train_if_missing=False)
+    if not _MODELS_LOADED.is_set():
+        raise RuntimeError(
+            "No trained models found. Run `python models/enhanced_prediction.py` "
+            "from the project root before starting Gunicorn."
+        )
+    # SQLite connections must not cross fork(); close the ones init_db opened
+    with app.app_context():
+        db.engine.dispose()
+
+
+def post_fork(server, worker):
+    """Give each worker a fresh connection pool instead of the master's"""
+    from backend.app import app, db
+
+    # close=False leaves any inherited connections for the master to close
+    with app.app_context():
+        db.engine.dispose(close=False)
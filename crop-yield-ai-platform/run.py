@@ -8,10 +8,16 @@ import os
 import sys
 from backend.app import app
 
+# Debug mode and the reloader slow every request, so they are opt-in (CROP_DEV=1).
+# For production, serve with Gunicorn instead of this script:
+#     gunicorn -c gunicorn_conf.py backend.app:app
+DEV = os.environ.get('CROP_DEV') == '1'
+
 if __name__ == '__main__':
-    # Set environment variables for development
-    os.environ['FLASK_ENV'] = 'development'
-    os.environ['FLASK_DEBUG'] = '1'
+    if DEV:
+        # Set environment variables for development
+        os.environ['FLASK_ENV'] = 'development'
+        os.environ['FLASK_DEBUG'] = '1'
     
     # Create necessary directories
     os.makedirs('data', exist_ok=True)
@@ -57,8 +63,8 @@ if __name__ == '__main__':
         app.run(
             host='0.0.0.0',
             port=5000,
-            debug=True,
-            use_reloader=True,
+            debug=DEV,
+            use_reloader=DEV,
             threaded=True
         )
     except KeyboardInterrupt:
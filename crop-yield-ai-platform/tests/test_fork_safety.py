@@ -0,0 +1,93 @@
+"""
+Models loaded in a parent process (e.g. the Gunicorn master) must stay usable
+in forked children. Run from the project root:
+    python -m unittest discover tests
+"""
+
+import os
+
+# Force a multi-threaded OpenMP runtime so a fork-unsafe state would deadlock
+# even on single-core machines; must be set before scikit-learn is imported
+os.environ['OMP_NUM_THREADS'] = '4'
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+sys.path.insert(0, MODELS_DIR)
+
+from enhanced_prediction import CropYieldPredictor
+
+CHILD_TIMEOUT_SECONDS = 30
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+class ForkAfterLoadTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.workdir = tempfile.mkdtemp()
+        # Train in a separate process, as the offline training step does, so
+        # this process never starts OpenMP before forking
+        subprocess.run(
+            [sys.executable, os.path.join(MODELS_DIR, 'enhanced_prediction.py')],
+            cwd=cls.workdir, check=True, stdout=subprocess.DEVNULL
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.workdir, ignore_errors=True)
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        os.chdir(self.workdir)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+
+    def _predict_in_child(self, predictor):
+        """Fork, predict in the child and return its exit status (None if it hung)"""
+        pid = os.fork()
+        if pid == 0:
+            try:
+                # Uncached input so the child really runs every model
+                ensemble_pred, _, _ = predictor.predict_yield('rice', 2.3, 1412, 27, 6.4, 80, 7)
+                os._exit(0 if ensemble_pred > 0 else 1)
+            except BaseException:
+                os._exit(2)
+
+        deadline = time.monotonic() + CHILD_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                return os.waitstatus_to_exitcode(status)
+            time.sleep(0.05)
+        os.kill(pid, 9)
+        os.waitpid(pid, 0)
+        return None
+
+    def test_child_can_predict_after_parent_loads(self):
+        predictor = CropYieldPredictor()
+        self.assertTrue(predictor.load_models(train_if_missing=False))
+
+        self.assertEqual(self._predict_in_child(predictor), 0)
+        # ...and the parent keeps working after the child exits
+        ensemble_pred, _, _ = predictor.predict_yield('wheat', 1.5, 550, 20, 7.0, 90, 6)
+        self.assertGreater(ensemble_pred, 0)
+
+    def test_load_only_does_not_train(self):
+        empty_dir = tempfile.mkdtemp()
+        try:
+            os.chdir(empty_dir)
+            self.assertFalse(CropYieldPredictor().load_models(train_if_missing=False))
+            self.assertFalse(os.path.exists('models'))
+        finally:
+            os.chdir(self.workdir)
+            shutil.rmtree(empty_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()